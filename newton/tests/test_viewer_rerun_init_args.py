@@ -15,244 +15,143 @@
 
 import unittest
 import warnings
-from unittest.mock import Mock, patch
+from unittest.mock import ANY, Mock, patch
 
-# ruff: noqa: PLC0415
+from newton._src.viewer import viewer_rerun
+from newton._src.viewer.viewer_rerun import ViewerRerun
 
 
 class TestViewerRerunInitArgs(unittest.TestCase):
     """Unit tests for ViewerRerun initialization parameters."""
 
-    def setUp(self):
-        """Create a fresh mock rerun object for each test."""
-        self.mock_rr = Mock()
-        self.mock_rr.init = Mock()
-        self.mock_rr.spawn = Mock()
-        self.mock_rr.connect_grpc = Mock()
-        self.mock_rr.set_time = Mock()
-        self.mock_rr.save = Mock()
-
-        # Mock blueprint module and components
-        self.mock_rrb = Mock()
-        self.mock_blueprint = Mock()
-        self.mock_rrb.Blueprint = Mock(return_value=self.mock_blueprint)
-        self.mock_rrb.Horizontal = Mock(return_value=Mock())
-        self.mock_rrb.Spatial3DView = Mock(return_value=Mock())
-        self.mock_rrb.TimePanel = Mock(return_value=Mock())
-        self.mock_rrb.TimeSeriesView = Mock(return_value=Mock())
-
-    def test_default_spawns_viewer(self):
-        """Test that ViewerRerun() with no arguments spawns a viewer."""
-        with patch("newton._src.viewer.viewer_rerun.rr", self.mock_rr):
-            with patch("newton._src.viewer.viewer_rerun.rrb", self.mock_rrb):
-                with patch("newton._src.viewer.viewer_rerun._is_jupyter_notebook", return_value=False):
-                    from newton._src.viewer.viewer_rerun import ViewerRerun
-
-                    # Suppress deprecation warnings for cleaner test output
-                    with warnings.catch_warnings():
-                        warnings.simplefilter("ignore")
-                        _ = ViewerRerun()
-
-                    # Verify rr.init was called with app_id as positional arg and blueprint
-                    from unittest.mock import ANY
-
-                    self.mock_rr.init.assert_called_once_with("newton-viewer", default_blueprint=ANY)
-
-                    # Verify rr.spawn() was called
-                    self.mock_rr.spawn.assert_called_once()
-
-                    # Verify rr.connect_grpc() was NOT called
-                    self.mock_rr.connect_grpc.assert_not_called()
-
-    def test_explicit_address_none_spawns_viewer(self):
-        """Test that ViewerRerun(address=None) explicitly spawns a viewer."""
-        with patch("newton._src.viewer.viewer_rerun.rr", self.mock_rr):
-            with patch("newton._src.viewer.viewer_rerun.rrb", self.mock_rrb):
-                with patch("newton._src.viewer.viewer_rerun._is_jupyter_notebook", return_value=False):
-                    from newton._src.viewer.viewer_rerun import ViewerRerun
+    @classmethod
+    def setUpClass(cls):
+        """Create the rerun mocks once; setUp resets their recorded calls before each test."""
+        # Mock auto-creates rr.init, rr.spawn, rr.connect_grpc, etc. on first access
+        cls.mock_rr = Mock()
 
-                    with warnings.catch_warnings():
-                        warnings.simplefilter("ignore")
-                        _ = ViewerRerun(address=None)
+        # Mock blueprint module; only the Blueprint instance is checked by identity
+        cls.mock_rrb = Mock()
+        cls.mock_blueprint = Mock()
+        cls.mock_rrb.Blueprint.return_value = cls.mock_blueprint
 
-                    # Verify rr.spawn() was called when address is None
-                    self.mock_rr.spawn.assert_called_once()
-
-                    # Verify rr.connect_grpc() was NOT called
+    def setUp(self):
+        """Reset the shared rerun mocks and patch them into the viewer module for each test."""
+        self._reset_mocks()
+
+        # Patch the rerun modules for the whole test; addCleanup undoes the patches even if the test fails
+        self._start_patch(patch.object(viewer_rerun, "rr", self.mock_rr))
+        self._start_patch(patch.object(viewer_rerun, "rrb", self.mock_rrb))
+        self.mock_is_jupyter = self._start_patch(patch.object(viewer_rerun, "_is_jupyter_notebook", return_value=False))
+
+    def _reset_mocks(self):
+        # reset_mock() clears recorded calls but keeps the configured return values
+        self.mock_rr.reset_mock()
+        self.mock_rrb.reset_mock()
+
+    def _start_patch(self, patcher):
+        mock = patcher.start()
+        self.addCleanup(patcher.stop)
+        return mock
+
+    def _create_viewer(self, **kwargs):
+        # Suppress deprecation warnings for cleaner test output
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            return ViewerRerun(**kwargs)
+
+    def test_launch_mode(self):
+        """Test that ViewerRerun spawns a viewer or connects via gRPC depending on address and environment."""
+        test_address = "localhost:9876"
+        # (constructor kwargs, running in Jupyter, expect rr.spawn(), expected rr.connect_grpc() address)
+        cases = [
+            ({}, False, True, None),
+            ({"address": None}, False, True, None),
+            ({"address": test_address}, False, False, test_address),
+            ({"address": test_address}, True, False, test_address),
+            ({}, True, False, None),
+        ]
+        for kwargs, in_jupyter, expect_spawn, expect_address in cases:
+            with self.subTest(kwargs=kwargs, in_jupyter=in_jupyter):
+                self._reset_mocks()
+                self.mock_is_jupyter.return_value = in_jupyter
+
+                viewer = self._create_viewer(**kwargs)
+
+                self.assertEqual(viewer.is_jupyter_notebook, in_jupyter)
+
+                # Verify rr.init was called with app_id as positional arg and blueprint
+                self.mock_rr.init.assert_called_once_with("newton-viewer", default_blueprint=ANY)
+
+                # An explicit address always connects via gRPC, even in Jupyter
+                if expect_address is not None:
+                    self.mock_rr.connect_grpc.assert_called_once_with(expect_address)
+                else:
                     self.mock_rr.connect_grpc.assert_not_called()
 
-    def test_custom_address_connects_grpc(self):
-        """Test that ViewerRerun(address='...') connects via gRPC."""
-        with patch("newton._src.viewer.viewer_rerun.rr", self.mock_rr):
-            with patch("newton._src.viewer.viewer_rerun.rrb", self.mock_rrb):
-                with patch("newton._src.viewer.viewer_rerun._is_jupyter_notebook", return_value=False):
-                    from newton._src.viewer.viewer_rerun import ViewerRerun
-
-                    test_address = "localhost:9876"
-                    with warnings.catch_warnings():
-                        warnings.simplefilter("ignore")
-                        _ = ViewerRerun(address=test_address)
-
-                    # Verify rr.init was called with app_id as positional arg and blueprint
-                    from unittest.mock import ANY
-
-                    self.mock_rr.init.assert_called_once_with("newton-viewer", default_blueprint=ANY)
-
-                    # Verify rr.connect_grpc() was called with the address
-                    self.mock_rr.connect_grpc.assert_called_once_with(test_address)
-
-                    # Verify rr.spawn() was NOT called
-                    self.mock_rr.spawn.assert_not_called()
-
-    def test_custom_address_connects_grpc_in_jupyter(self):
-        """Test that ViewerRerun(address='...') connects via gRPC even in Jupyter notebooks."""
-        with patch("newton._src.viewer.viewer_rerun.rr", self.mock_rr):
-            with patch("newton._src.viewer.viewer_rerun.rrb", self.mock_rrb):
-                with patch("newton._src.viewer.viewer_rerun._is_jupyter_notebook", return_value=True):
-                    from newton._src.viewer.viewer_rerun import ViewerRerun
-
-                    test_address = "localhost:9876"
-                    with warnings.catch_warnings():
-                        warnings.simplefilter("ignore")
-                        viewer = ViewerRerun(address=test_address)
-
-                    # Verify viewer detected Jupyter environment
-                    self.assertTrue(viewer.is_jupyter_notebook)
-
-                    # Verify rr.connect_grpc() was called with the address even in Jupyter
-                    self.mock_rr.connect_grpc.assert_called_once_with(test_address)
-
-                    # Verify rr.spawn() was NOT called
+                # Without an address, a viewer is only spawned outside Jupyter
+                if expect_spawn:
+                    self.mock_rr.spawn.assert_called_once()
+                else:
                     self.mock_rr.spawn.assert_not_called()
 
     def test_custom_app_id_used(self):
         """Test that custom app_id is passed to rr.init."""
-        with patch("newton._src.viewer.viewer_rerun.rr", self.mock_rr):
-            with patch("newton._src.viewer.viewer_rerun.rrb", self.mock_rrb):
-                with patch("newton._src.viewer.viewer_rerun._is_jupyter_notebook", return_value=False):
-                    from newton._src.viewer.viewer_rerun import ViewerRerun
-
-                    custom_app_id = "my-simulation-123"
-                    with warnings.catch_warnings():
-                        warnings.simplefilter("ignore")
-                        viewer = ViewerRerun(app_id=custom_app_id)
-
-                    # Verify rr.init was called with custom app_id as positional arg and blueprint
-                    from unittest.mock import ANY
+        custom_app_id = "my-simulation-123"
+        viewer = self._create_viewer(app_id=custom_app_id)
 
-                    self.mock_rr.init.assert_called_once_with(custom_app_id, default_blueprint=ANY)
+        # Verify rr.init was called with custom app_id as positional arg and blueprint
+        self.mock_rr.init.assert_called_once_with(custom_app_id, default_blueprint=ANY)
 
-                    # Verify the viewer stored the app_id correctly
-                    self.assertEqual(viewer.app_id, custom_app_id)
+        # Verify the viewer stored the app_id correctly
+        self.assertEqual(viewer.app_id, custom_app_id)
 
     def test_blueprint_passed_to_init(self):
         """Test that blueprint is created and passed to rr.init()."""
-        with patch("newton._src.viewer.viewer_rerun.rr", self.mock_rr):
-            with patch("newton._src.viewer.viewer_rerun.rrb", self.mock_rrb):
-                with patch("newton._src.viewer.viewer_rerun._is_jupyter_notebook", return_value=False):
-                    from newton._src.viewer.viewer_rerun import ViewerRerun
+        self._create_viewer()
 
-                    with warnings.catch_warnings():
-                        warnings.simplefilter("ignore")
-                        _ = ViewerRerun()
+        # Verify blueprint components were created
+        self.mock_rrb.Blueprint.assert_called_once()
+        self.mock_rrb.Spatial3DView.assert_called()
+        self.mock_rrb.TimePanel.assert_called()
 
-                    # Verify blueprint components were created
-                    self.mock_rrb.Blueprint.assert_called_once()
-                    self.mock_rrb.Spatial3DView.assert_called()
-                    self.mock_rrb.TimePanel.assert_called()
-
-                    # Verify blueprint was passed to rr.init
-                    call_args = self.mock_rr.init.call_args
-                    self.assertIn("default_blueprint", call_args[1])
-                    self.assertEqual(call_args[1]["default_blueprint"], self.mock_blueprint)
+        # Verify blueprint was passed to rr.init
+        self.mock_rr.init.assert_called_once_with("newton-viewer", default_blueprint=self.mock_blueprint)
 
     def test_record_to_rrd_calls_save(self):
         """Test that providing record_to_rrd calls rr.save() with blueprint."""
-        with patch("newton._src.viewer.viewer_rerun.rr", self.mock_rr):
-            with patch("newton._src.viewer.viewer_rerun.rrb", self.mock_rrb):
-                with patch("newton._src.viewer.viewer_rerun._is_jupyter_notebook", return_value=False):
-                    from newton._src.viewer.viewer_rerun import ViewerRerun
-
-                    test_path = "test_recording.rrd"
-                    with warnings.catch_warnings():
-                        warnings.simplefilter("ignore")
-                        _ = ViewerRerun(record_to_rrd=test_path)
-
-                    # Verify rr.save was called
-                    self.mock_rr.save.assert_called_once()
-                    call_args = self.mock_rr.save.call_args
-                    self.assertEqual(call_args[0][0], test_path)
-                    self.assertIn("default_blueprint", call_args[1])
-                    self.assertEqual(call_args[1]["default_blueprint"], self.mock_blueprint)
-
-    def test_jupyter_notebook_skips_spawn(self):
-        """Test that viewer is not spawned in Jupyter notebook environment."""
-        with patch("newton._src.viewer.viewer_rerun.rr", self.mock_rr):
-            with patch("newton._src.viewer.viewer_rerun.rrb", self.mock_rrb):
-                with patch("newton._src.viewer.viewer_rerun._is_jupyter_notebook", return_value=True):
-                    from newton._src.viewer.viewer_rerun import ViewerRerun
-
-                    with warnings.catch_warnings():
-                        warnings.simplefilter("ignore")
-                        viewer = ViewerRerun()
-
-                    # Verify viewer detected Jupyter environment
-                    self.assertTrue(viewer.is_jupyter_notebook)
-
-                    # Verify rr.spawn() was NOT called in Jupyter
-                    self.mock_rr.spawn.assert_not_called()
-
-                    # Verify rr.connect_grpc() was NOT called
-                    self.mock_rr.connect_grpc.assert_not_called()
+        test_path = "test_recording.rrd"
+        self._create_viewer(record_to_rrd=test_path)
 
-    def test_non_jupyter_spawns_viewer(self):
-        """Test that viewer is spawned in non-Jupyter environment."""
-        with patch("newton._src.viewer.viewer_rerun.rr", self.mock_rr):
-            with patch("newton._src.viewer.viewer_rerun.rrb", self.mock_rrb):
-                with patch("newton._src.viewer.viewer_rerun._is_jupyter_notebook", return_value=False):
-                    from newton._src.viewer.viewer_rerun import ViewerRerun
-
-                    with warnings.catch_warnings():
-                        warnings.simplefilter("ignore")
-                        viewer = ViewerRerun()
-
-                    # Verify viewer detected non-Jupyter environment
-                    self.assertFalse(viewer.is_jupyter_notebook)
-
-                    # Verify rr.spawn() WAS called in non-Jupyter
-                    self.mock_rr.spawn.assert_called_once()
+        # Verify rr.save was called with the recording path and blueprint
+        self.mock_rr.save.assert_called_once_with(test_path, default_blueprint=self.mock_blueprint)
 
     def test_keep_historical_data_stored(self):
         """Test that keep_historical_data parameter is stored correctly."""
-        with patch("newton._src.viewer.viewer_rerun.rr", self.mock_rr):
-            with patch("newton._src.viewer.viewer_rerun.rrb", self.mock_rrb):
-                with patch("newton._src.viewer.viewer_rerun._is_jupyter_notebook", return_value=False):
-                    from newton._src.viewer.viewer_rerun import ViewerRerun
+        viewer_true = self._create_viewer(keep_historical_data=True)
+        viewer_false = self._create_viewer(keep_historical_data=False)
 
-                    with warnings.catch_warnings():
-                        warnings.simplefilter("ignore")
-                        viewer_true = ViewerRerun(keep_historical_data=True)
-                        viewer_false = ViewerRerun(keep_historical_data=False)
-
-                    # Verify parameters were stored correctly
-                    self.assertTrue(viewer_true.keep_historical_data)
-                    self.assertFalse(viewer_false.keep_historical_data)
+        # Verify parameters were stored correctly
+        self.assertTrue(viewer_true.keep_historical_data)
+        self.assertFalse(viewer_false.keep_historical_data)
 
     def test_keep_scalar_history_stored(self):
         """Test that keep_scalar_history parameter is stored correctly."""
-        with patch("newton._src.viewer.viewer_rerun.rr", self.mock_rr):
-            with patch("newton._src.viewer.viewer_rerun.rrb", self.mock_rrb):
-                with patch("newton._src.viewer.viewer_rerun._is_jupyter_notebook", return_value=False):
-                    from newton._src.viewer.viewer_rerun import ViewerRerun
-
-                    with warnings.catch_warnings():
-                        warnings.simplefilter("ignore")
-                        viewer_true = ViewerRerun(keep_scalar_history=True)
-                        viewer_false = ViewerRerun(keep_scalar_history=False)
-
-                    # Verify parameters were stored correctly
-                    self.assertTrue(viewer_true.keep_scalar_history)
-                    self.assertFalse(viewer_false.keep_scalar_history)
+        viewer_true = self._create_viewer(keep_scalar_history=True)
+        viewer_false = self._create_viewer(keep_scalar_history=False)
+
+        # Verify parameters were stored correctly
+        self.assertTrue(viewer_true.keep_scalar_history)
+        self.assertFalse(viewer_false.keep_scalar_history)
+
+    def test_missing_rerun_raises_import_error(self):
+        """Test that ViewerRerun() raises ImportError when the rerun package is unavailable."""
+        # ViewerRerun checks rr at construction time, so swapping the attribute is enough; no module reload needed
+        with patch.object(viewer_rerun, "rr", None):
+            with self.assertRaises(ImportError):
+                self._create_viewer()
+
+        self.mock_rr.init.assert_not_called()
 
 
 if __name__ == "__main__":